@@ -66,10 +66,11 @@ customized iteration procedure.
 mod query;
 mod error;
 
+use std::sync::OnceLock;
 pub use reqwest::Error;
 pub use query::{QueryParams, SortOrder, BrokerItem};
 pub use error::{BrokerError};
-use crate::query::QueryResult;
+use crate::query::{QueryResult, MAX_PAGE_SIZE};
 
 /// BgpkitBroker struct maintains the broker's URL and handles making API queries.
 ///
@@ -99,41 +100,15 @@ impl BgpkitBroker {
     /// See [QueryParams] for the parameters you can pass in.
     pub fn query(&self, params: &QueryParams) -> Result<Vec<BrokerItem>, BrokerError> {
         let url = format!("{}/search{}", &self.broker_url, params);
-        log::info!("sending broker query to {}", &url);
-        match run_query(url.as_str()) {
-            Ok(res) => Ok(res),
-            Err(e) => Err(e)
-        }
+        run_query(url.as_str()).map(|res| res.data)
     }
 
     /// Send query to get **all** data times returned.
     pub fn query_all(&self, params: &QueryParams) -> Result<Vec<BrokerItem>, BrokerError> {
-        let mut p: QueryParams = params.clone();
-        let mut items = vec![];
-        loop {
-            let url = format!("{}/search{}", &self.broker_url, &p);
-            let res_items = match run_query(url.as_str()) {
-                Ok(res) => res,
-                Err(e) => {return Err(e)}
-            };
-
-            let items_count = res_items.len() as i64;
-
-            if items_count ==0 {
-                // reaches the end
-                break;
-            }
-
-            items.extend(res_items);
-            let cur_page = p.page;
-            p = p.page(cur_page+1);
-
-            if items_count < params.page_size {
-                // reaches the end
-                break;
-            }
-        }
-        Ok(items)
+        query_all_pages(params, |p| {
+            let url = format!("{}/search{}", &self.broker_url, p);
+            run_query(url.as_str())
+        })
     }
 
     /// set query parameters for broker. needed for iterator.
@@ -142,9 +117,22 @@ impl BgpkitBroker {
     }
 }
 
-fn run_query(url: &str) -> Result<Vec<BrokerItem>, BrokerError>{
+/// Process-wide HTTP client shared by every [BgpkitBroker] instance and iterator, so that connections
+/// can be reused across pages and brokers. Individual brokers cannot use their own client config.
+static CLIENT: OnceLock<reqwest::blocking::Client> = OnceLock::new();
+
+/// Get the shared HTTP client, building it on first use.
+fn get_client() -> Result<&'static reqwest::blocking::Client, BrokerError> {
+    if let Some(client) = CLIENT.get() {
+        return Ok(client)
+    }
+    let client = reqwest::blocking::Client::builder().build()?;
+    Ok(CLIENT.get_or_init(|| client))
+}
+
+fn run_query(url: &str) -> Result<QueryResult, BrokerError>{
     log::info!("sending broker query to {}", &url);
-    match reqwest::blocking::get(url) {
+    match get_client()?.get(url).send() {
         Ok(res) => {
             match res.json::<QueryResult>()
             {
@@ -152,7 +140,7 @@ fn run_query(url: &str) -> Result<Vec<BrokerItem>, BrokerError>{
                     if let Some(e) = res.error {
                         Err(BrokerError::BrokerError(e))
                     } else {
-                        Ok(res.data)
+                        Ok(res)
                     }
                 },
                 Err(e) => {
@@ -166,6 +154,51 @@ fn run_query(url: &str) -> Result<Vec<BrokerItem>, BrokerError>{
     }
 }
 
+/// Fetch pages starting from `params.page` with `fetch` until the last page is reached.
+fn query_all_pages<F>(params: &QueryParams, mut fetch: F) -> Result<Vec<BrokerItem>, BrokerError>
+    where F: FnMut(&QueryParams) -> Result<QueryResult, BrokerError>
+{
+    let mut p: QueryParams = params.clone();
+    let mut items = vec![];
+    loop {
+        let res = match fetch(&p) {
+            Ok(res) => res,
+            Err(e) => {return Err(e)}
+        };
+
+        if res.data.is_empty() {
+            // reaches the end
+            break;
+        }
+
+        let last_page = is_last_page(&res, p.page_size);
+        items.extend(res.data);
+        if last_page {
+            // reaches the end
+            break;
+        }
+
+        let cur_page = p.page;
+        p = p.page(cur_page+1);
+    }
+    Ok(items)
+}
+
+/// Check if a query result is a partial page.
+///
+/// A page only counts as partial if it is shorter than the requested page size, the page size
+/// reported by the server, and the API's maximum page size. If the server reports no page size,
+/// this returns false and callers keep querying until an empty page is returned.
+fn is_last_page(res: &QueryResult, requested_page_size: i64) -> bool {
+    match res.page_size {
+        Some(page_size) => {
+            let expected = requested_page_size.min(page_size).min(MAX_PAGE_SIZE);
+            (res.data.len() as i64) < expected
+        },
+        None => false
+    }
+}
+
 /// Iterator for BGPKIT Broker that iterates through one [BrokerItem] at a time.
 ///
 /// The [IntoIterator] trait is implemented for both the struct and the reference, so that you can
@@ -197,14 +230,16 @@ fn run_query(url: &str) -> Result<Vec<BrokerItem>, BrokerError>{
 pub struct BrokerItemIterator {
     broker_url: String,
     query_params: QueryParams,
-    cached_items: Vec<BrokerItem>,
+    cached_items: std::vec::IntoIter<BrokerItem>,
     first_run: bool,
+    /// set when the last query returned a partial page, i.e. there are no more items to fetch
+    reached_end: bool,
 }
 
 impl BrokerItemIterator {
     pub fn new(broker: BgpkitBroker) -> BrokerItemIterator {
         let params = broker.query_params.clone();
-        BrokerItemIterator{broker_url: broker.broker_url, query_params: params, cached_items: vec![], first_run: true}
+        BrokerItemIterator{broker_url: broker.broker_url, query_params: params, cached_items: vec![].into_iter(), first_run: true, reached_end: false}
     }
 }
 
@@ -214,37 +249,41 @@ impl Iterator for BrokerItemIterator {
     fn next(&mut self) -> Option<Self::Item> {
         if self.first_run {
             let url = format!("{}/search{}", &self.broker_url, &self.query_params);
-            let items = match run_query(url.as_str()) {
-                Ok(i) => i,
+            let res = match run_query(url.as_str()) {
+                Ok(res) => res,
                 Err(_)  => return None
             };
-            if items.is_empty() {
+            if res.data.is_empty() {
                 // first run, nothing returned
                 return None
             } else {
-                self.cached_items = items;
-                self.cached_items.reverse();
+                self.reached_end = is_last_page(&res, self.query_params.page_size);
+                self.cached_items = res.data.into_iter();
             }
             self.first_run=false;
         }
 
-        if let Some(item) = self.cached_items.pop() {
+        if let Some(item) = self.cached_items.next() {
             Some(item)
         } else {
+            if self.reached_end {
+                // last page was not full, no need to query the next one
+                return None
+            }
             self.query_params.page += 1;
             let url = format!("{}/search{}", &self.broker_url, &self.query_params);
-            let items = match run_query(url.as_str()) {
-                Ok(i) => i,
+            let res = match run_query(url.as_str()) {
+                Ok(res) => res,
                 Err(_)  => return None
             };
-            if items.is_empty() {
+            if res.data.is_empty() {
                 // first run, nothing returned
                 return None
             } else {
-                self.cached_items = items;
-                self.cached_items.reverse();
+                self.reached_end = is_last_page(&res, self.query_params.page_size);
+                self.cached_items = res.data.into_iter();
             }
-            Some(self.cached_items.pop().unwrap())
+            Some(self.cached_items.next().unwrap())
         }
     }
 }
@@ -270,6 +309,7 @@ impl IntoIterator for &BgpkitBroker {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::query::QueryResult;
 
     #[test]
     fn test_query() {
@@ -341,6 +381,57 @@ mod tests {
         assert_eq!(broker.into_iter().count(), 6);
     }
 
+    fn make_result(num_items: usize, page_size: Option<i64>) -> QueryResult {
+        let ts = "2021-10-20T01:30:00".parse::<chrono::NaiveDateTime>().unwrap();
+        let data = (0..num_items).map(|_| BrokerItem {
+            ts_start: ts,
+            ts_end: ts,
+            collector_id: "rrc00".to_string(),
+            data_type: "rib".to_string(),
+            url: "https://example.com/bview.gz".to_string(),
+            rough_size: 0,
+            exact_size: 0,
+        }).collect::<Vec<BrokerItem>>();
+        QueryResult{count: Some(num_items as i64), page: None, page_size, error: None, data}
+    }
+
+    #[test]
+    fn test_is_last_page() {
+        // full page
+        assert!(!is_last_page(&make_result(10, Some(10)), 10));
+        // short page
+        assert!(is_last_page(&make_result(5, Some(10)), 10));
+        // no page size reported: keep querying until an empty page
+        assert!(!is_last_page(&make_result(5, None), 10));
+        // server caps the page size and reports the capped value
+        assert!(!is_last_page(&make_result(100, Some(100)), 200));
+        // server echoes a requested page size above the maximum
+        assert!(!is_last_page(&make_result(100000, Some(200000)), 200000));
+    }
+
+    #[test]
+    fn test_query_all_pages() {
+        // stops on a short page without querying further
+        let mut pages = vec![make_result(10, Some(10)), make_result(3, Some(10))].into_iter();
+        let mut calls = 0;
+        let items = query_all_pages(&QueryParams::new(), |_| {
+            calls += 1;
+            Ok(pages.next().unwrap())
+        }).unwrap();
+        assert_eq!(items.len(), 13);
+        assert_eq!(calls, 2);
+
+        // keeps querying until an empty page when no page size is reported
+        let mut pages = vec![make_result(10, None), make_result(3, None), make_result(0, None)].into_iter();
+        let mut seen_pages = vec![];
+        let items = query_all_pages(&QueryParams::new(), |p| {
+            seen_pages.push(p.page);
+            Ok(pages.next().unwrap())
+        }).unwrap();
+        assert_eq!(items.len(), 13);
+        assert_eq!(seen_pages, vec![1, 2, 3]);
+    }
+
     #[test]
     fn test_filters() {
         let mut params = QueryParams {
@@ -42,6 +42,9 @@ pub struct QueryParams {
     pub page_size: i64,
 }
 
+/// Maximum number of items per page allowed by the backend API.
+pub(crate) const MAX_PAGE_SIZE: i64 = 100000;
+
 /// Sorting order enum
 #[derive(Debug, Serialize, Deserialize, Clone)]
 pub enum SortOrder {
@@ -77,30 +80,24 @@ impl Display for SortOrder {
 
 impl std::fmt::Display for QueryParams {
     fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
-        let mut params_vec = vec![];
+        // `page` and `page_size` are always written last, so each optional parameter ends with `&`
+        write!(f, "?")?;
         if let Some(v) = &self.ts_start {
-            params_vec.push(format!("ts_start={}", v));
+            write!(f, "ts_start={}&", v)?;
         }
         if let Some(v) = &self.ts_end {
-            params_vec.push(format!("ts_end={}", v));
+            write!(f, "ts_end={}&", v)?;
         }
         if let Some(v) = &self.collector_id {
-            params_vec.push(format!("collector_id={}", v));
+            write!(f, "collector_id={}&", v)?;
         }
         if let Some(v) = &self.project {
-            params_vec.push(format!("project={}", v));
+            write!(f, "project={}&", v)?;
         }
         if let Some(v) = &self.data_type {
-            params_vec.push(format!("data_type={}", v));
-        }
-        params_vec.push(format!("page={}", self.page));
-        params_vec.push(format!("page_size={}", self.page_size));
-
-        if !params_vec.is_empty() {
-            write!(f, "?{}", params_vec.join("&"))
-        } else {
-            write!(f, "")
+            write!(f, "data_type={}&", v)?;
         }
+        write!(f, "page={}&page_size={}", self.page, self.page_size)
     }
 }
 
@@ -273,5 +270,17 @@ mod tests {
         };
 
         assert_eq!("?page=1&page_size=20".to_string(), param.to_string());
+
+        let param = QueryParams{
+            ts_start: Some("1".to_string()),
+            ts_end: Some("2".to_string()),
+            collector_id: Some("rrc00".to_string()),
+            project: Some("riperis".to_string()),
+            data_type: Some("rib".to_string()),
+            page: 2,
+            page_size: 10
+        };
+
+        assert_eq!("?ts_start=1&ts_end=2&collector_id=rrc00&project=riperis&data_type=rib&page=2&page_size=10".to_string(), param.to_string());
     }
 }
\ No newline at end of file